@@ -1,89 +1,370 @@
+# cython: language_level=3, boundscheck=False
 import sys
 import os
-from bs4 import BeautifulSoup
+import re
+import mmap
+import html
+import types
+import zlib
+import pickle
+import hashlib
+import tempfile
+from array import array
+from itertools import islice
+import multiprocessing
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree
 from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, 
                                QLabel, QListWidget, QPushButton, QFileDialog, QMessageBox, QAbstractItemView, QCheckBox)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QThread, Signal, Slot
+
+# Duplicate detection stores 64-bit digests of the keys instead of the keys.
+try:
+    import xxhash
+
+    def key_digest(text, seed=0):
+        return xxhash.xxh3_64_intdigest(text.encode('utf-8'), seed)
+except ImportError:
+    def key_digest(text, seed=0):
+        return hash((seed, text)) & 0xFFFFFFFFFFFFFFFF
+
+# Below this many keys the plain loop is done before numba has finished
+# compiling it.
+JIT_MIN_KEYS = 2_000_000
+
+def mark_first_occurrences(hashes, mask):
+    """
+    Sets mask[i] for the first occurrence of every value in hashes.
+    Kept numba-compatible: indexed loop, no Python objects besides the set.
+    """
+    seen = set()
+    for i in range(len(hashes)):
+        h = hashes[i]
+        if h not in seen:
+            seen.add(h)
+            mask[i] = True
+
+# Built by setup.py when Cython and a C++ compiler are available.
+try:
+    from merge_core import mark_first_occurrences as mark_first_occurrences_c
+except ImportError:
+    mark_first_occurrences_c = None
+
+# None until jit_mark_first_occurrences has run, then the kernel or False.
+mark_first_occurrences_jit = None
+
+def jit_mark_first_occurrences():
+    """
+    Returns mark_first_occurrences compiled with numba, or None without numba.
+    numba is only imported here, on first use: spawned parse workers import
+    this module too and never need it.
+    """
+    global mark_first_occurrences_jit
+    if mark_first_occurrences_jit is None:
+        mark_first_occurrences_jit = False
+        # A Cython build has already compiled the loop and numba cannot read it.
+        if isinstance(mark_first_occurrences, types.FunctionType):
+            try:
+                from numba import njit
+            except ImportError:
+                pass
+            else:
+                mark_first_occurrences_jit = njit(mark_first_occurrences)
+    return mark_first_occurrences_jit or None
+
+def unique_mask(hashes):
+    """
+    Takes an array('Q') of key hashes and returns one flag per hash, true
+    where the hash is seen for the first time.
+    """
+    if mark_first_occurrences_c is not None:
+        mask = bytearray(len(hashes))
+        mark_first_occurrences_c(hashes, mask)
+    else:
+        jit = jit_mark_first_occurrences() if len(hashes) >= JIT_MIN_KEYS else None
+        if jit is not None:
+            import numpy as np  # numba depends on it
+            mask = np.zeros(len(hashes), dtype=np.bool_)
+            jit(np.frombuffer(hashes, dtype=np.uint64), mask)
+        else:
+            mask = bytearray(len(hashes))
+            mark_first_occurrences(hashes, mask)
+    return mask
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Parsed files are cached by path, modification time and size. Bump
+# PARSE_CACHE_VERSION whenever the shape of parse_bookmarks' result changes.
+PARSE_CACHE_VERSION = 3
+PARSE_CACHE_MAX_ENTRIES = 200
+PARSE_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'bookmark_merger')
+
+if zstandard is not None:
+    PARSE_CACHE_SUFFIX = '.pkl.zst'
+
+    def compress_cache(data):
+        return zstandard.ZstdCompressor(level=3).compress(data)
+
+    def decompress_cache(data):
+        return zstandard.ZstdDecompressor().decompress(data)
+else:
+    PARSE_CACHE_SUFFIX = '.pkl.z'
+
+    def compress_cache(data):
+        return zlib.compress(data, 1)
+
+    decompress_cache = zlib.decompress
+
+def parse_cache_path(file_path):
+    st = os.stat(file_path)
+    key = f'{os.path.abspath(file_path)}|{st.st_mtime_ns}|{st.st_size}|{PARSE_CACHE_VERSION}'
+    name = hashlib.blake2b(key.encode('utf-8', 'surrogateescape'), digest_size=16).hexdigest()
+    return os.path.join(PARSE_CACHE_DIR, name + PARSE_CACHE_SUFFIX)
+
+def load_parse_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            bookmarks = pickle.loads(decompress_cache(f.read()))
+    except Exception:
+        return None
+    # Mark the entry as recently used for prune_parse_cache. A read-only
+    # cache directory still serves hits.
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return bookmarks
+
+def store_parse_cache(cache_path, bookmarks):
+    # Write to a temporary file and rename it so other processes never see
+    # a partial entry. The cache is only an optimisation; ignore failures.
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        data = compress_cache(pickle.dumps(bookmarks, pickle.HIGHEST_PROTOCOL))
+        fd, tmp_path = tempfile.mkstemp(dir=PARSE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        pass
+
+def prune_parse_cache(max_entries=PARSE_CACHE_MAX_ENTRIES):
+    """
+    Deletes the least recently used cache entries beyond max_entries.
+    """
+    try:
+        entries = [e for e in os.scandir(PARSE_CACHE_DIR) if e.is_file()]
+    except OSError:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in entries[max_entries:]:
+        try:
+            os.unlink(e.path)
+        except OSError:
+            pass
+
+# One match per <DL>, </DL>, <H3 ...>title</H3> or <A ...>title</A>, the only
+# tags that carry structure or data in a Netscape bookmark file, plus
+# <!-- comments --> so that tags inside them are skipped. Quoted attribute
+# values may contain '>'. The attribute run is possessive: when a token fails
+# to match, the regex must not retry every way of splitting it. Any other
+# <H3 or <A, e.g. one whose title holds markup, and an unclosed comment match
+# as 'bad' so the scan can give up instead of losing them.
+TOKEN_RE = re.compile(
+    rb'<(?:(?P<comment>!--.*?-->)'
+    rb'|(?P<close>/)?DL\b[^>]*>'
+    rb'|(?P<tag>H3|A)\b(?P<attrs>(?:[^>"\'<]++|"[^"<]*+"|\'[^\'<]*+\')*+)>(?P<title>[^<]*)</(?P=tag)\s*>'
+    rb'|(?P<bad>(?:H3|A)\b|!--))',
+    re.IGNORECASE | re.DOTALL)
+# name="value", name='value' or name=value
+ATTR_RE = re.compile(rb'([\w-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))')
 
 def parse_bookmarks(file_path):
     """
     Parses a Netscape format bookmark file.
     Returns a list of bookmark/folder dictionaries (hierarchical).
+    Unchanged files are loaded from the parse cache instead.
     """
     root_bookmarks = []
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            soup = BeautifulSoup(f, 'html.parser')
-            dl = soup.find('dl')
-            if dl:
-                root_bookmarks = process_dl(dl)
+        cache_path = parse_cache_path(file_path)
+        cached = load_parse_cache(cache_path)
+        if cached is not None:
+            return cached
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    prefetch(mm)
+                    root_bookmarks = scan_bookmarks(mm)
+        if not root_bookmarks:
+            root_bookmarks = parse_bookmarks_lxml(file_path)
+        if root_bookmarks:
+            store_parse_cache(cache_path, root_bookmarks)
     except Exception as e:
         print(f"Error parsing {file_path}: {e}")
     return root_bookmarks
 
-def process_dl(dl_element):
-    items = []
-    for child in dl_element.children:
-        if child.name == 'dt':
-            items.extend(process_dt(child))
-        elif child.name == 'p':
-            items.extend(process_container(child))
-    return items
-
-def process_container(element):
-    items = []
-    for child in element.children:
-        if child.name == 'dt':
-            items.extend(process_dt(child))
-        elif child.name == 'p':
-            items.extend(process_container(child))
-    return items
-
-def process_dt(dt_element):
-    item = None
-    
-    # Check H3 (Folder) or A (Bookmark)
-    h3 = dt_element.find('h3', recursive=False)
-    a = dt_element.find('a', recursive=False)
-    
-    if h3:
-        item = {
-            'type': 'folder',
-            'title': h3.get_text(),
-            'add_date': h3.get('add_date'),
-            'last_modified': h3.get('last_modified'),
-            'children': []
-        }
-        dl = dt_element.find('dl', recursive=False)
-        if dl:
-            item['children'] = process_dl(dl)
-            
-    elif a:
-        item = {
-            'type': 'bookmark',
-            'title': a.get_text(),
-            'url': a.get('href'),
-            'add_date': a.get('add_date'),
-            'icon': a.get('icon')
-        }
-    
-    result = []
-    if item:
-        result.append(item)
-    
-    # Process "siblings" buried in children (due to parser nesting)
-    for child in dt_element.children:
-        if child is h3 or child is a:
+def prefetch(mm):
+    """
+    Asks the kernel to start reading the whole mapping in the background so
+    scan_bookmarks overlaps with the disk instead of faulting page by page.
+    """
+    if hasattr(mmap, 'MADV_WILLNEED'):  # Not available on Windows
+        mm.madvise(mmap.MADV_WILLNEED)
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+def decode_text(raw):
+    text = raw.decode('utf-8', 'ignore')
+    return html.unescape(text) if '&' in text else text
+
+def scan_bookmarks(data) -> list:
+    """
+    Builds the bookmark tree straight from the tag stream, without a DOM.
+    Works on the well-formed files browsers export; returns an empty list if
+    no root <DL> is found, or if an <H3>/<A> or a comment cannot be read or a
+    bookmark has no HREF, so the caller can fall back to a real HTML parser.
+    """
+    root: list = []
+    stack: list = []
+    pending_folder = None
+    # Exports repeat folder titles, URLs and especially favicon data URIs, so
+    # keep one copy of each; that also shrinks the pickle sent back from a
+    # worker process, which writes a repeated object only once.
+    intern = sys.intern
+    icons: dict = {}
+    for m in TOKEN_RE.finditer(data):
+        tag = m.group('tag')
+        if tag is None:
+            if m.group('comment'):
+                continue
+            if m.group('close'):
+                if len(stack) <= 1:
+                    break
+                stack.pop()
+            elif m.group('bad'):
+                return []
+            else:
+                if pending_folder is not None:
+                    stack.append(pending_folder['children'])
+                    pending_folder = None
+                else:
+                    stack.append(stack[-1] if stack else root)
             continue
-        if child.name == 'dl': 
-            continue # Already handled as children
-            
-        if child.name == 'dt':
-            result.extend(process_dt(child))
-        elif child.name == 'p':
-            result.extend(process_container(child))
-            
-    return result
+        if not stack:
+            continue
+
+        attrs = {name.lower(): decode_text(double or single or bare)
+                 for name, double, single, bare in ATTR_RE.findall(m.group('attrs'))}
+        if tag.lower() == b'h3':
+            pending_folder = {
+                'type': 'folder',
+                'title': intern(decode_text(m.group('title'))),
+                'add_date': attrs.get(b'add_date'),
+                'last_modified': attrs.get(b'last_modified'),
+                'children': []
+            }
+            item = pending_folder
+        else:
+            url = attrs.get(b'href')
+            if url is None:
+                return []
+            icon = attrs.get(b'icon')
+            item = {
+                'type': 'bookmark',
+                'title': intern(decode_text(m.group('title'))),
+                'url': intern(url),
+                'add_date': attrs.get(b'add_date'),
+                'icon': icons.setdefault(icon, icon) if icon else icon
+            }
+            pending_folder = None
+        stack[-1].append(item)
+    return root
+
+def parse_bookmarks_lxml(file_path):
+    """
+    Slow path for files the token scanner cannot make sense of. Streams
+    libxml2's parse events and builds the bookmark tree as they arrive.
+    """
+    # lxml closes the unclosed <DT>/<DD>/<p> tags early and moves a folder's
+    # <DL> out of its <DT>, sometimes into a <DD>, so follow document order
+    # and hand each <DL> to the <H3> that precedes it on the same level.
+    # One [items, pending_folder] entry per open <DL>.
+    root_bookmarks = []
+    stack = []
+    inside = 0  # open <H3>/<A> elements; whatever they contain is title text
+    intern = sys.intern
+    icons: dict = {}
+    # Bookmark exports are UTF-8 whether or not they carry a charset <META>.
+    events = etree.iterparse(file_path, events=('start', 'end'), tag=('dl', 'h3', 'a'),
+                             html=True, encoding='utf-8')
+    try:
+        for event, elem in events:
+            tag = elem.tag
+            if tag != 'dl':
+                if event == 'start':
+                    inside += 1
+                    continue
+                inside -= 1
+                if inside or not stack:
+                    continue
+                level = stack[-1]
+                get = elem.get
+                if tag == 'h3':
+                    folder = {
+                        'type': 'folder',
+                        'title': intern(''.join(elem.itertext())),
+                        'add_date': get('add_date'),
+                        'last_modified': get('last_modified'),
+                        'children': []
+                    }
+                    level[0].append(folder)
+                    level[1] = folder
+                else:
+                    url = get('href')
+                    icon = get('icon')
+                    level[0].append({
+                        'type': 'bookmark',
+                        'title': intern(''.join(elem.itertext())),
+                        'url': intern(url) if url else url,
+                        'add_date': get('add_date'),
+                        'icon': icons.setdefault(icon, icon) if icon else icon
+                    })
+                    level[1] = None
+                elem.clear(keep_tail=True)
+            elif inside:
+                continue
+            elif event == 'start':
+                if not stack:
+                    stack.append([root_bookmarks, None])
+                    continue
+                level = stack[-1]
+                folder = level[1]
+                if folder is not None:
+                    level[1] = None
+                    stack.append([folder['children'], None])
+                else:
+                    stack.append([level[0], None])
+            else:
+                stack.pop()
+                if not stack:
+                    break
+                elem.clear(keep_tail=True)
+    except etree.XMLSyntaxError:
+        # Raised when the file holds no markup at all.
+        pass
+    return root_bookmarks
+
+WRITE_CHUNK_LINES = 4096
 
 def generate_netscape_html(bookmarks, output_file):
     """
@@ -101,51 +382,281 @@ def generate_netscape_html(bookmarks, output_file):
     footer = "</DL><p>"
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
             f.write(header)
-            write_items(f, bookmarks, 1)
+            # Joining a few thousand lines per write costs less than handing
+            # every line to the text layer on its own.
+            lines = write_items(bookmarks, 1)
+            while True:
+                chunk = ''.join(islice(lines, WRITE_CHUNK_LINES))
+                if not chunk:
+                    break
+                f.write(chunk)
             f.write(footer)
         return True
     except Exception as e:
         return str(e)
 
-def write_items(f, items, indent_level):
-    indent = "    " * indent_level
-    for item in items:
-        if item.get('type') == 'folder':
-            title = escape_html(item.get('title', 'No Title'))
-            add_date = item.get('add_date', '')
-            last_modified = item.get('last_modified', '')
-            
-            attr_str = ''
-            if add_date: attr_str += f' ADD_DATE="{add_date}"'
-            if last_modified: attr_str += f' LAST_MODIFIED="{last_modified}"'
-            
-            f.write(f'{indent}<DT><H3{attr_str}>{title}</H3>\n')
-            f.write(f'{indent}<DL><p>\n')
-            write_items(f, item.get('children', []), indent_level + 1)
-            f.write(f'{indent}</DL><p>\n')
-            
-        elif item.get('type') == 'bookmark':
-            title = escape_html(item.get('title', 'No Title'))
-            url = item.get('url', '')
-            add_date = item.get('add_date', '')
-            icon = item.get('icon', '')
-            
-            attr_str = f'HREF="{url}"'
-            if add_date: attr_str += f' ADD_DATE="{add_date}"'
-            if icon: attr_str += f' ICON="{icon}"'
-            
-            f.write(f'{indent}<DT><A {attr_str}>{title}</A>\n')
+def write_items(items, indent_level):
+    # Iterates with a stack of child iterators instead of recursing, the
+    # same way MergeWorker walks the trees.
+    stack = [(iter(items), "    " * indent_level)]
+    while stack:
+        children, indent = stack[-1]
+        for item in children:
+            if item.get('type') == 'folder':
+                title = escape_html(item.get('title', 'No Title'))
+                add_date = item.get('add_date', '')
+                last_modified = item.get('last_modified', '')
+                
+                date_attr = f' ADD_DATE="{add_date}"' if add_date else ''
+                modified_attr = f' LAST_MODIFIED="{last_modified}"' if last_modified else ''
+                
+                yield f'{indent}<DT><H3{date_attr}{modified_attr}>{title}</H3>\n'
+                yield f'{indent}<DL><p>\n'
+                stack.append((iter(item.get('children', [])), indent + "    "))
+                break
+                
+            elif item.get('type') == 'bookmark':
+                title = escape_html(item.get('title', 'No Title'))
+                url = item.get('url', '')
+                add_date = item.get('add_date', '')
+                icon = item.get('icon', '')
+                
+                date_attr = f' ADD_DATE="{add_date}"' if add_date else ''
+                icon_attr = f' ICON="{icon}"' if icon else ''
+                
+                yield f'{indent}<DT><A HREF="{url}"{date_attr}{icon_attr}>{title}</A>\n'
+        else:
+            stack.pop()
+            if stack:
+                yield f'{stack[-1][1]}</DL><p>\n'
+
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
 
 def escape_html(text):
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    # Most titles need no escaping and the substring checks are cheaper
+    # than a translate pass that copies the string.
+    if '&' in text or '<' in text or '>' in text:
+        return text.translate(_HTML_ESCAPE_TABLE)
+    return text
+
+# Query parameters that only record where a link was clicked from, besides
+# every utm_* parameter.
+TRACKING_PARAMS = frozenset({'gclid', 'fbclid'})
+
+def norm_url(url):
+    """
+    Returns the form of a URL used to detect duplicates: lower-case scheme and
+    host, no tracking parameters or trailing slash, and no fragment unless it
+    is a route (#/... or #!...) that picks the page in a single-page app. User
+    info is kept as it is, since it tells apart accounts on the same site.
+    """
+    if not url:
+        return ''
+    try:
+        p = urlsplit(url)
+        host = p.hostname or ''
+        if ':' in host:
+            host = f'[{host}]'  # IPv6 literal
+        port = p.port
+        user, password = p.username, p.password
+    except ValueError:
+        return url
+    netloc = host
+    if port:
+        netloc += f':{port}'
+    if user is not None:
+        userinfo = user if password is None else f'{user}:{password}'
+        netloc = f'{userinfo}@{netloc}'
+    query = p.query
+    if query:
+        query = urlencode([(k, v) for k, v in parse_qsl(query, keep_blank_values=True)
+                           if not (k.startswith('utm_') or k in TRACKING_PARAMS)])
+    fragment = p.fragment if p.fragment.startswith(('/', '!')) else ''
+    return urlunsplit((p.scheme.lower(), netloc, p.path.rstrip('/') or '/', query, fragment))
+
+
+class MergeWorker(QObject):
+    """
+    Parses, merges and saves the bookmark files away from the GUI thread.
+    progress carries (percent of files parsed, status text); finished carries
+    (success, saved path or error message, duplicates ignored).
+    """
+    progress = Signal(int, str)
+    finished = Signal(bool, str, int)
+
+    def __init__(self, file_list, save_path, remove_duplicates, crit_folder, crit_title, crit_url):
+        super().__init__()
+        self.file_list = file_list
+        self.save_path = save_path
+        self.remove_duplicates = remove_duplicates
+        self.crit_folder = crit_folder
+        self.crit_title = crit_title
+        self.crit_url = crit_url
+
+    @Slot()
+    def run(self):
+        try:
+            result, duplicate_count = self.merge()
+        except Exception as e:
+            result, duplicate_count = str(e), 0
+        if result is True:
+            self.finished.emit(True, self.save_path, duplicate_count)
+        else:
+            self.finished.emit(False, result, duplicate_count)
+
+    def merge(self):
+        remove_duplicates = self.remove_duplicates
+        crit_folder = self.crit_folder
+        crit_title = self.crit_title
+        crit_url = self.crit_url
+
+        merged_bookmarks = []
+        
+        # Merged exports mostly repeat the same URLs, so normalise each once.
+        norm_cache = {}
+        cached_norm = norm_cache.get
+
+        def norm(url):
+            normalized = cached_norm(url)
+            if normalized is None:
+                normalized = norm_cache[url] = norm_url(url)
+            return normalized
+
+        # One key builder per criteria combination, so the per-bookmark call
+        # tests no flags and builds no list. seed identifies the folder chain
+        # when 'By Folder' is set: collect_keys hashes each folder title
+        # seeded with its parent's hash, once per folder, and is 0 otherwise.
+        if crit_url and crit_title:
+            def get_key(item, seed):
+                return key_digest(f"{norm(item.get('url'))}\x1e{item.get('title') or ''}", seed)
+        elif crit_url:
+            def get_key(item, seed):
+                return key_digest(norm(item.get('url')), seed)
+        elif crit_title:
+            def get_key(item, seed):
+                return key_digest(item.get('title') or '', seed)
+        else:
+            def get_key(item, seed):
+                return key_digest('', seed)
+
+        # Both walks below keep a stack of (iterator over a folder's items,
+        # folder context) and descend by pushing the child folder, so deep
+        # trees cost no Python frames and cannot hit the recursion limit.
+        def collect_keys(keys, source):
+            # Must visit bookmarks in the same order as merge_tree.
+            append = keys.append
+            build_key = get_key
+            digest = key_digest
+            by_folder = crit_folder
+            stack = [(iter(source), 0)]
+            push = stack.append
+            pop = stack.pop
+            while stack:
+                items, path_hash = stack[-1]
+                for item in items:
+                    item_type = item['type']
+                    if item_type == 'folder':
+                        push((iter(item['children']),
+                              digest(item.get('title', 'No Title'), path_hash) if by_folder else 0))
+                        break
+                    elif item_type == 'bookmark':
+                        append(build_key(item, path_hash))
+                else:
+                    pop()
+
+        # Merged folders are interned by (parent folder id, title), an id being
+        # the folder's slot in merged_children, so a folder coming from any
+        # file finds its merged counterpart with a single lookup.
+        merged_ids = {}
+        merged_children = [merged_bookmarks]
+
+        def merge_tree(source, keep):
+            """
+            Merges one parsed file into merged_bookmarks and returns the
+            number of duplicates it skipped.
+            """
+            ids = merged_ids
+            children = merged_children
+            duplicates = 0
+            stack = [(iter(source), merged_bookmarks.append, 0)]
+            push = stack.append
+            pop = stack.pop
+            while stack:
+                items, append, parent_id = stack[-1]
+                for item in items:
+                    item_type = item['type']
+                    if item_type == 'folder':
+                        item_get = item.get
+                        folder_title = item_get('title', 'No Title')
+
+                        # Merge folders if they have same title (always merge structure)
+                        key = (parent_id, folder_title)
+                        folder_id = ids.get(key)
+                        if folder_id is None:
+                            new_folder = {
+                                'type': 'folder',
+                                'title': folder_title,
+                                'add_date': item_get('add_date'),
+                                'last_modified': item_get('last_modified'),
+                                'children': []
+                            }
+                            append(new_folder)
+                            folder_id = ids[key] = len(children)
+                            target = new_folder['children']
+                            children.append(target)
+                        else:
+                            target = children[folder_id]
+                        push((iter(item['children']), target.append, folder_id))
+                        break
+
+                    elif item_type == 'bookmark':
+                        if keep is None or keep():
+                            append(item)
+                        else:
+                            duplicates += 1
+                else:
+                    pop()
+            return duplicates
+
+        # Files are parsed in parallel but merged in list order, so the
+        # first file still wins when choosing which duplicate to keep.
+        file_list = self.file_list
+        trees = []
+        if len(file_list) == 1:
+            # Starting a worker process costs more than parsing one file here.
+            trees.append(parse_bookmarks(file_list[0]))
+            self.progress.emit(100, "Parsing...")
+        else:
+            workers = min(len(file_list), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                for i, bookmarks in enumerate(executor.map(parse_bookmarks, file_list), 1):
+                    trees.append(bookmarks)
+                    self.progress.emit(i * 100 // len(file_list), "Parsing...")
+
+        # Hash every bookmark up front so duplicates are found in one pass
+        # over a flat list, then let the merge consume the verdicts in order.
+        keep = None
+        if remove_duplicates:
+            # One packed 64-bit slot per bookmark rather than a list of int objects.
+            keys = array('Q')
+            for bookmarks in trees:
+                collect_keys(keys, bookmarks)
+            keep = iter(unique_mask(keys)).__next__
+        duplicate_count = 0
+        for bookmarks in trees:
+            duplicate_count += merge_tree(bookmarks, keep)
+
+        return generate_netscape_html(merged_bookmarks, self.save_path), duplicate_count
 
 
 class BookmarkMergerApp(QWidget):
     def __init__(self):
         super().__init__()
         self.file_list = []
+        self.file_set = set()
         self.initUI()
 
     def initUI(self):
@@ -227,31 +738,38 @@ class BookmarkMergerApp(QWidget):
             "HTML Files (*.html *.htm);;All Files (*.*)"
         )
         if files:
-            for f in files:
-                if f not in self.file_list:
-                    self.file_list.append(f)
-                    self.listbox.addItem(f)
+            new_files = [f for f in dict.fromkeys(files) if f not in self.file_set]
+            self.file_set.update(new_files)
+            self.file_list.extend(new_files)
+            self.listbox.addItems(new_files) # One batched insert instead of one per file
             self.status_lbl.setText(f"{len(self.file_list)} files selected.")
 
     def remove_files(self):
         selected_items = self.listbox.selectedItems()
         if not selected_items:
             return
-        for item in selected_items:
-            row = self.listbox.row(item)
-            self.listbox.takeItem(row) # Removes from widget
-            # To remove from self.file_list, we need to be careful about synchronization
-            # Simpler to reconstruct list from widget
+        rows = sorted((self.listbox.row(item) for item in selected_items), reverse=True)
+        # Remove each contiguous run of rows in one call, bottom first, so the
+        # rows still to be removed keep their numbers.
+        model = self.listbox.model()
+        end = 0
+        while end < len(rows):
+            start = end
+            while end + 1 < len(rows) and rows[end + 1] == rows[end] - 1:
+                end += 1
+            model.removeRows(rows[end], end - start + 1)
+            end += 1
         
-        # Rebuild file_list from widget items
-        self.file_list = []
-        for i in range(self.listbox.count()):
-            self.file_list.append(self.listbox.item(i).text())
+        # The widget rows mirror file_list, so drop the same positions
+        removed = set(rows)
+        self.file_list = [f for i, f in enumerate(self.file_list) if i not in removed]
+        self.file_set = set(self.file_list)
             
         self.status_lbl.setText(f"{len(self.file_list)} files selected.")
 
     def clear_list(self):
         self.file_list = []
+        self.file_set = set()
         self.listbox.clear()
         self.status_lbl.setText("List cleared.")
 
@@ -280,75 +798,49 @@ class BookmarkMergerApp(QWidget):
             return
 
         self.status_lbl.setText("Merging...")
-        QApplication.processEvents()
+        self.btn_merge.setEnabled(False)
 
-        seen_keys = set()
-        merged_bookmarks = []
-        duplicate_count = 0
-        
-        def get_key(item, path):
-            k = []
-            if crit_folder:
-                k.append(path)
-            if crit_url:
-                k.append(item.get('url'))
-            if crit_title:
-                k.append(item.get('title'))
-            return tuple(k)
-
-        def recursive_merge(target, source, current_path=()):
-            nonlocal duplicate_count
-            for item in source:
-                if item['type'] == 'folder':
-                    # Check if folder exists in target
-                    found = None
-                    folder_title = item.get('title', 'No Title')
-                    
-                    # Merge folders if they have same title (always merge structure)
-                    for t in target:
-                        if t['type'] == 'folder' and t['title'] == folder_title:
-                            found = t
-                            break
-                    if found:
-                        recursive_merge(found['children'], item['children'], current_path + (folder_title,))
-                    else:
-                        new_folder = {
-                            'type': 'folder',
-                            'title': folder_title,
-                            'add_date': item.get('add_date'),
-                            'last_modified': item.get('last_modified'),
-                            'children': []
-                        }
-                        target.append(new_folder)
-                        recursive_merge(new_folder['children'], item['children'], current_path + (folder_title,))
-                        
-                elif item['type'] == 'bookmark':
-                    if remove_duplicates:
-                        key = get_key(item, current_path)
-                        if key in seen_keys:
-                            duplicate_count += 1
-                        else:
-                            seen_keys.add(key)
-                            target.append(item)
-                    else:
-                        target.append(item)
-
-        for file_path in self.file_list:
-            bookmarks = parse_bookmarks(file_path)
-            recursive_merge(merged_bookmarks, bookmarks)
-        
-        result = generate_netscape_html(merged_bookmarks, save_path)
+        self.merge_thread = QThread()
+        self.merge_worker = MergeWorker(list(self.file_list), save_path, remove_duplicates,
+                                        crit_folder, crit_title, crit_url)
+        self.merge_worker.moveToThread(self.merge_thread)
+        self.merge_thread.started.connect(self.merge_worker.run)
+        self.merge_worker.progress.connect(self.merge_progress)
+        self.merge_worker.finished.connect(self.merge_finished)
+        self.merge_worker.finished.connect(self.merge_thread.quit)
+        # Only allow the next merge once this thread has actually stopped.
+        self.merge_thread.finished.connect(lambda: self.btn_merge.setEnabled(True))
+        self.merge_thread.start()
 
-        
-        if result is True:
-            QMessageBox.information(self, "Success", f"Successfully merged bookmarks.\nIgnored {duplicate_count} duplicates.\nSaved to: {save_path}")
+    def closeEvent(self, event):
+        # Destroying the thread mid-merge would abort the application, so
+        # close once the merge has finished writing its file instead.
+        thread = getattr(self, 'merge_thread', None)
+        if thread is not None and thread.isRunning():
+            self.status_lbl.setText("Finishing merge, closing when done...")
+            thread.finished.connect(self.close)
+            event.ignore()
+            return
+        super().closeEvent(event)
+
+    def merge_progress(self, percent, text):
+        self.status_lbl.setText(f"{text} ({percent}%)")
+
+    def merge_finished(self, success, message, duplicate_count):
+        if success:
+            QMessageBox.information(self, "Success", f"Successfully merged bookmarks.\nIgnored {duplicate_count} duplicates.\nSaved to: {message}")
             self.status_lbl.setText("Merge complete.")
         else:
-            QMessageBox.critical(self, "Error", f"Failed to save file: {result}")
+            QMessageBox.critical(self, "Error", f"Failed to save file: {message}")
             self.status_lbl.setText("Error during merge.")
 
-if __name__ == "__main__":
+def main():
+    prune_parse_cache()
     app = QApplication(sys.argv)
     ex = BookmarkMergerApp()
     ex.show()
     sys.exit(app.exec())
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
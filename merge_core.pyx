@@ -0,0 +1,20 @@
+# distutils: language = c++
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled duplicate check used by bookmark_merger.unique_mask when built.
+"""
+from libc.stdint cimport uint64_t
+from libcpp.unordered_set cimport unordered_set
+
+
+def mark_first_occurrences(const uint64_t[:] hashes, unsigned char[:] mask):
+    """
+    Sets mask[i] for the first occurrence of every value in hashes.
+    """
+    cdef unordered_set[uint64_t] seen
+    cdef Py_ssize_t i, n = hashes.shape[0]
+    seen.reserve(n)
+    with nogil:
+        for i in range(n):
+            if seen.insert(hashes[i]).second:
+                mask[i] = 1
@@ -0,0 +1,54 @@
+"""
+Optional build script that compiles bookmark_merger.py with Cython, along
+with the merge_core duplicate-check kernel (C++).
+
+    pip install cython
+    pip install --no-build-isolation .
+
+Without Cython or a working C/C++ compiler the plain Python module is
+installed instead, so this never stops the application from being installed.
+"""
+from setuptools import setup
+from setuptools.command.build_ext import build_ext
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+
+
+class optional_build_ext(build_ext):
+    """Falls back to the pure Python module when compilation fails."""
+
+    def run(self):
+        try:
+            super().run()
+        except PlatformError as e:
+            self.warn(f"C compiler not available, using pure Python module: {e}")
+
+    def build_extensions(self):
+        self.check_extensions_list(self.extensions)
+        failed = []
+        for ext in self.extensions:
+            try:
+                self.build_extension(ext)
+            except (CCompilerError, ExecError, PlatformError) as e:
+                self.warn(f"Building {ext.name} failed, using pure Python module: {e}")
+                failed.append(ext)
+        # Nothing to copy or install for the modules that did not build.
+        for ext in failed:
+            self.extensions.remove(ext)
+
+
+ext_modules = []
+if cythonize is not None:
+    ext_modules = cythonize(['bookmark_merger.py', 'merge_core.pyx'], language_level=3)
+
+setup(
+    name='bookmark-merger',
+    py_modules=['bookmark_merger'],
+    ext_modules=ext_modules,
+    cmdclass={'build_ext': optional_build_ext},
+    entry_points={'gui_scripts': ['bookmark-merger = bookmark_merger:main']},
+)
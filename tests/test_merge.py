@@ -0,0 +1,60 @@
+import pytest
+
+import bookmark_merger
+
+FIRST = b'''<DL><p>
+<DT><H3>Bar</H3>
+<DL><p>
+<DT><A HREF="https://x.com/">X</A>
+<DT><H3>Bar</H3>
+<DL><p>
+<DT><A HREF="https://y.com">Y</A>
+</DL><p>
+</DL><p>
+<DT><A HREF="https://x.com">X</A>
+</DL><p>
+'''
+
+SECOND = b'''<DL><p>
+<DT><H3>Bar</H3>
+<DL><p>
+<DT><H3>Bar</H3>
+<DL><p>
+<DT><A HREF="https://y.com/?utm_source=feed">Y</A>
+<DT><A HREF="https://x.com">X</A>
+</DL><p>
+<DT><A HREF="https://z.com">X</A>
+</DL><p>
+</DL><p>
+'''
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # The environment variable reaches the spawned parse workers.
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.setattr(bookmark_merger, 'PARSE_CACHE_DIR', str(tmp_path / 'cache' / 'bookmark_merger'))
+
+
+def outline(items):
+    return [(item['title'], outline(item['children'])) if item['type'] == 'folder' else item['url']
+            for item in items]
+
+
+@pytest.mark.parametrize('crit_folder, crit_title, crit_url, duplicates, merged', [
+    (False, False, True, 3,
+     [('Bar', ['https://x.com/', ('Bar', ['https://y.com']), 'https://z.com'])]),
+    (True, False, True, 1,
+     [('Bar', ['https://x.com/', ('Bar', ['https://y.com', 'https://x.com']), 'https://z.com']),
+      'https://x.com']),
+    (False, True, False, 4,
+     [('Bar', ['https://x.com/', ('Bar', ['https://y.com'])])]),
+], ids=['url', 'folder+url', 'title'])
+def test_merge_removes_duplicates(tmp_path, crit_folder, crit_title, crit_url, duplicates, merged):
+    first, second, out = tmp_path / 'first.html', tmp_path / 'second.html', tmp_path / 'out.html'
+    first.write_bytes(FIRST)
+    second.write_bytes(SECOND)
+    worker = bookmark_merger.MergeWorker([str(first), str(second)], str(out), True,
+                                         crit_folder, crit_title, crit_url)
+    assert worker.merge() == (True, duplicates)
+    assert outline(bookmark_merger.parse_bookmarks(str(out))) == merged
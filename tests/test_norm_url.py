@@ -0,0 +1,24 @@
+from bookmark_merger import norm_url
+
+
+def test_user_info_is_kept():
+    assert norm_url('https://alice@x.com/') != norm_url('https://bob@x.com/')
+    assert norm_url('https://Bob:PW@X.COM:8080/a/') == 'https://Bob:PW@x.com:8080/a'
+
+
+def test_host_case_and_tracking_params_are_ignored():
+    assert norm_url('HTTPS://Example.COM/path/?utm_source=feed#top') == 'https://example.com/path'
+
+
+def test_ipv6_host_keeps_brackets():
+    assert norm_url('http://[::1]:8080/x') == 'http://[::1]:8080/x'
+
+
+def test_any_utm_param_is_dropped():
+    assert norm_url('https://x.com/?utm_reader=feedly&id=1&fbclid=z') == 'https://x.com/?id=1'
+
+
+def test_hash_routes_are_kept_and_anchors_dropped():
+    assert norm_url('https://mail.x.com/#/inbox') != norm_url('https://mail.x.com/#/sent')
+    assert norm_url('https://x.com/app/#!/a') == 'https://x.com/app#!/a'
+    assert norm_url('https://x.com/doc#intro') == 'https://x.com/doc'
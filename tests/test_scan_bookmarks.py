@@ -0,0 +1,81 @@
+import pytest
+
+import bookmark_merger
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(bookmark_merger, 'PARSE_CACHE_DIR', str(tmp_path / 'cache'))
+
+
+def write(tmp_path, body):
+    path = tmp_path / 'bookmarks.html'
+    path.write_bytes(b'<!DOCTYPE NETSCAPE-Bookmark-file-1>\n<DL><p>\n' + body + b'\n</DL><p>\n')
+    return str(path)
+
+
+def test_unquoted_and_single_quoted_attributes(tmp_path):
+    bookmarks = bookmark_merger.parse_bookmarks(write(tmp_path, (
+        b"<DT><A HREF='https://e.com' ADD_DATE='1'>E</A>\n"
+        b'<DT><A HREF=https://f.com ADD_DATE=2>F</A>\n'
+        b'<DT><A HREF="https://g.com/?a>b">G</A>')))
+    assert [(b['url'], b['add_date'], b['title']) for b in bookmarks] == [
+        ('https://e.com', '1', 'E'),
+        ('https://f.com', '2', 'F'),
+        ('https://g.com/?a>b', None, 'G'),
+    ]
+
+
+def test_markup_in_bookmark_title_falls_back(tmp_path):
+    body = (b'<DT><A HREF="https://c.com">C</A>\n'
+            b'<DT><A HREF="https://d.com">D <b>bold</b></A>')
+    assert bookmark_merger.scan_bookmarks(body.join([b'<DL><p>', b'</DL>'])) == []
+    bookmarks = bookmark_merger.parse_bookmarks(write(tmp_path, body))
+    assert [(b['url'], b['title']) for b in bookmarks] == [
+        ('https://c.com', 'C'),
+        ('https://d.com', 'D bold'),
+    ]
+
+
+def test_markup_in_folder_title_keeps_its_children(tmp_path):
+    bookmarks = bookmark_merger.parse_bookmarks(write(tmp_path, (
+        b'<DT><H3>Nested <i>markup</i></H3>\n'
+        b'<DL><p>\n<DT><A HREF="https://h.com">H</A>\n</DL><p>\n'
+        b'<DT><A HREF="https://i.com">I</A>')))
+    folder, bookmark = bookmarks
+    assert folder['title'] == 'Nested markup'
+    assert [b['url'] for b in folder['children']] == ['https://h.com']
+    assert bookmark['url'] == 'https://i.com'
+
+
+def test_bookmark_without_href_is_not_scanned():
+    assert bookmark_merger.scan_bookmarks(b'<DL><p><DT><A ADD_DATE="1">x</A></DL>') == []
+
+
+FIREFOX_ATTRS = (b' HREF="https://x.com/a" ADD_DATE="1700000000" LAST_MODIFIED="1700000001"'
+                 b' ICON_URI="https://x.com/favicon.ico" ICON="data:image/png;base64,AAAA" TAGS="a,b"')
+
+
+def test_many_attributes_and_markup_in_title_falls_back(tmp_path):
+    body = b'<DT><A' + FIREFOX_ATTRS + b'>T <b>x</b></A>'
+    assert bookmark_merger.scan_bookmarks(body.join([b'<DL><p>', b'</DL>'])) == []
+    [bookmark] = bookmark_merger.parse_bookmarks(write(tmp_path, body))
+    assert (bookmark['url'], bookmark['title'], bookmark['icon']) == (
+        'https://x.com/a', 'T x', 'data:image/png;base64,AAAA')
+
+
+def test_unclosed_bookmark_with_many_attributes_falls_back(tmp_path):
+    body = b'<DT><A HREF="https://y.com">Y</A>\n<DT><A' + FIREFOX_ATTRS + b'>T'
+    assert bookmark_merger.scan_bookmarks(body.join([b'<DL><p>', b'</DL>'])) == []
+    bookmarks = bookmark_merger.parse_bookmarks(write(tmp_path, body))
+    assert [(b['url'], b['title'].strip()) for b in bookmarks] == [
+        ('https://y.com', 'Y'), ('https://x.com/a', 'T')]
+
+
+def test_commented_out_bookmarks_are_skipped(tmp_path):
+    body = (b'<!-- <DT><A HREF="https://x.com">X</A> -->\n'
+            b'<DT><A HREF="https://y.com">Y</A>\n'
+            b'<!--\n<DT><H3>Old</H3>\n<DL><p></DL><p>\n-->')
+    path = write(tmp_path, body)
+    for bookmarks in (bookmark_merger.parse_bookmarks(path), bookmark_merger.parse_bookmarks_lxml(path)):
+        assert [b['url'] for b in bookmarks] == ['https://y.com']